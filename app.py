@@ -5,19 +5,48 @@ Multi-chain token safety analysis with LIVE DATA from DexScreener + GoPlusLabs
 Supports: Solana, Ethereum, Base, Arbitrum, Polygon
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
 from flask_cors import CORS
+import orjson
+from cachetools import TTLCache
 import os
+import re
+import threading
+from bisect import bisect_right
+from operator import itemgetter
 import time
 import hashlib
 import requests
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
-import json
-from datetime import datetime, timedelta
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand orjson's bytes straight to the response, skipping the str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.config["COMPRESS_MIN_SIZE"] = 512
 CORS(app)
+Compress(app)
 
 # Configuration
 X402_PRICE_PER_CHECK = float(os.getenv("X402_PRICE_PER_CHECK", "0.01"))
@@ -29,9 +58,54 @@ PORT = int(os.getenv("PORT", "8000"))
 DEXSCREENER_API = "https://api.dexscreener.com/latest/dex"
 GOPLUS_API = "https://api.gopluslabs.io/api/v1"
 
-# In-memory cache (5 minute TTL)
-CACHE = {}
+# Shared HTTP session so upstream calls reuse pooled keep-alive connections
+# (only gateway 5xx answers are retried, without honoring Retry-After; connect
+# and read timeouts are not retried). Once retries run out the last 5xx response
+# is returned rather than raised, so the fetchers negatively cache it.
+UPSTREAM_RETRY = Retry(
+    total=2,
+    connect=0,
+    read=0,
+    backoff_factor=0.1,
+    status_forcelist=[502, 503, 504],
+    respect_retry_after_header=False,
+    raise_on_status=False,
+)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=UPSTREAM_RETRY))
+
+# Thread pool so the DexScreener and GoPlus round trips overlap
+# (two fetches per in-flight check, so by default twice the gunicorn request threads;
+# keep the GUNICORN_THREADS default in sync with gunicorn_conf.py)
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", str(2 * int(os.getenv("GUNICORN_THREADS", "16")))))
+FETCH_POOL = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+
+# Separate pool for /check_batch fan-out so a large batch never queues ahead of single checks
+BATCH_FETCH_WORKERS = int(os.getenv("BATCH_FETCH_WORKERS", "16"))
+BATCH_FETCH_POOL = ThreadPoolExecutor(max_workers=BATCH_FETCH_WORKERS)
+
+# Deadlines (seconds) for upstream fetches; a source that misses it counts as no data
+# and the resulting verdict is not cached.
+# Batches get longer since their fetches share BATCH_FETCH_POOL (kept under gunicorn's 30s timeout).
+UPSTREAM_DEADLINE = 6
+BATCH_UPSTREAM_DEADLINE = 20
+
+# In-memory cache (5 minute TTL, bounded size, shared by a worker's threads)
 CACHE_TTL = 300  # 5 minutes
+CACHE_MAX_SIZE = 10000
+CACHE = TTLCache(maxsize=CACHE_MAX_SIZE, ttl=CACHE_TTL)
+CACHE_LOCK = threading.Lock()
+
+# Negative cache for upstream lookups that returned no data (short TTL)
+NEG_CACHE_TTL = 60
+NEG_CACHE = TTLCache(maxsize=50000, ttl=NEG_CACHE_TTL)
+NEG_CACHE_LOCK = threading.Lock()
+
+# Metadata fields read by analyze_token_safety; only these vary the cache key
+SCORED_METADATA_KEYS = ("name", "holder_count", "liquidity_usd", "age_minutes", "volume_24h")
+
+# Batch checks
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "50"))
 
 # Chain configurations
 SUPPORTED_CHAINS = {
@@ -67,7 +141,58 @@ SUPPORTED_CHAINS = {
     }
 }
 
-@dataclass
+# Precomputed chain views (SUPPORTED_CHAINS is static after import)
+CHAIN_KEYS = list(SUPPORTED_CHAINS)
+CHAIN_KEY_SET = frozenset(CHAIN_KEYS)
+CHAINS_PAYLOAD = [
+    {"key": key, "name": info["name"], "chain_id": info["chain_id"]}
+    for key, info in SUPPORTED_CHAINS.items()
+]
+
+# Upstream endpoint URLs, resolved once per chain
+DEXSCREENER_TOKENS_URL = f"{DEXSCREENER_API}/tokens/"
+GOPLUS_URLS = {
+    key: f"{GOPLUS_API}/token_security/{info['goplus_id']}"
+    for key, info in SUPPORTED_CHAINS.items()
+}
+
+def build_tiers(tiers: Tuple[Tuple[float, int, str], ...]) -> Tuple[Tuple[float, ...], Tuple[Tuple[int, str], ...]]:
+    """Split (upper bound, penalty, label) rows into sorted bounds and outcomes, ending with PASS"""
+    bounds = tuple(bound for bound, _, _ in tiers)
+    outcomes = tuple((penalty, label) for _, penalty, label in tiers) + ((0, "PASS"),)
+    return bounds, outcomes
+
+
+# Tiered checks: (upper bound, penalty, label), first tier the value is below applies.
+# The penalty is subtracted from the safety score and added to the rug risk.
+LIQUIDITY_TIERS = build_tiers((
+    (1000, 30, "FAIL - Very low liquidity (< $1K)"),
+    (10000, 15, "WARNING - Low liquidity (< $10K)"),
+))
+AGE_TIERS = build_tiers((
+    (2, 25, "FAIL - Very new token (< 2 min, high risk)"),
+    (30, 10, "WARNING - New token (< 30 min)"),
+))
+VOLUME_TIERS = build_tiers((
+    (100, 10, "WARNING - Very low volume"),
+))
+HOLDER_TIERS = build_tiers((
+    (50, 20, "FAIL - Too few holders"),
+    (100, 10, "WARNING - Low holder count"),
+))
+METADATA_HOLDER_TIERS = build_tiers((
+    (100, 20, "FAIL - Too few holders"),
+))
+
+# Token address formats: 0x-prefixed 20-byte hex for EVM chains, base58 public key for Solana
+EVM_ADDRESS_RE = re.compile(r"0x[0-9a-fA-F]{40}")
+SOLANA_ADDRESS_RE = re.compile(r"[1-9A-HJ-NP-Za-km-z]{32,44}")
+
+# Scam keywords, compiled into a single case-insensitive alternation so names are scanned once
+SCAM_KEYWORDS = ["test", "fake", "scam", "rug", "honeypot", "xxx", "pump"]
+SCAM_RE = re.compile("|".join(map(re.escape, SCAM_KEYWORDS)), re.IGNORECASE)
+
+@dataclass(slots=True)
 class SafetyCheckResult:
     """Token safety check result"""
     safe: bool
@@ -82,25 +207,60 @@ class SafetyCheckResult:
     data_source: str  # "live" or "metadata"
 
 
-def get_cache_key(chain: str, token_address: str) -> str:
-    """Generate cache key"""
-    return f"{chain}:{token_address}"
+@dataclass(slots=True)
+class CachedCheck:
+    """Cached /check result"""
+    response: Dict[str, Any]
+    hit_body: bytes  # serialized response with from_cache set, served on hits
+    etag: str
+    cached_at: float  # time.monotonic(), the clock TTLCache expires entries by
+
 
+def get_cache_key(chain: str, token_address: str, metadata: Optional[Dict] = None) -> str:
+    """Generate cache key (the metadata fields the analysis reads are part of it)"""
+    scored = {key: metadata[key] for key in SCORED_METADATA_KEYS if key in metadata} if metadata else None
+    if not scored:
+        return f"{chain}:{token_address}"
 
-def get_from_cache(key: str) -> Optional[Dict]:
+    digest = hashlib.blake2b(orjson.dumps(scored), digest_size=8).hexdigest()
+    return f"{chain}:{token_address}:{digest}"
+
+
+def get_from_cache(key: str) -> Optional[CachedCheck]:
     """Get data from cache if not expired"""
-    if key in CACHE:
-        data, timestamp = CACHE[key]
-        if time.time() - timestamp < CACHE_TTL:
-            return data
-        else:
-            del CACHE[key]
-    return None
+    with CACHE_LOCK:
+        return CACHE.get(key)
+
+
+def make_cached_check(data: Dict) -> CachedCheck:
+    """Wrap a /check response with the JSON body served on cache hits and its ETag"""
+    hit_body = orjson.dumps({**data, "from_cache": True})
+    return CachedCheck(
+        response=data,
+        hit_body=hit_body,
+        etag=hashlib.blake2b(hit_body, digest_size=8).hexdigest(),
+        cached_at=time.monotonic(),
+    )
+
+
+def set_cache(key: str, data: Dict) -> CachedCheck:
+    """Set data in cache, along with the JSON body served on later hits and its ETag"""
+    entry = make_cached_check(data)
+    with CACHE_LOCK:
+        CACHE[key] = entry
+    return entry
+
 
+def is_negative_cached(key: Tuple) -> bool:
+    """Check whether an upstream recently had no data for this key"""
+    with NEG_CACHE_LOCK:
+        return key in NEG_CACHE
 
-def set_cache(key: str, data: Dict):
-    """Set data in cache"""
-    CACHE[key] = (data, time.time())
+
+def set_negative_cache(key: Tuple):
+    """Remember that an upstream had no data for this key"""
+    with NEG_CACHE_LOCK:
+        NEG_CACHE[key] = True
 
 
 def fetch_dexscreener_data(token_address: str) -> Optional[Dict]:
@@ -108,31 +268,44 @@ def fetch_dexscreener_data(token_address: str) -> Optional[Dict]:
     Fetch token data from DexScreener
     Returns: {liquidity_usd, age_minutes, holder_count (estimate), volume_24h, price}
     """
+    neg_key = ("dexscreener", token_address)
+    if is_negative_cached(neg_key):
+        return None
+
     try:
-        url = f"{DEXSCREENER_API}/tokens/{token_address}"
-        response = requests.get(url, timeout=5)
+        url = DEXSCREENER_TOKENS_URL + token_address
+        response = SESSION.get(url, timeout=5)
 
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
 
-            if data and 'pairs' in data and len(data['pairs']) > 0:
-                # Get the most liquid pair
-                pair = max(data['pairs'], key=lambda x: float(x.get('liquidity', {}).get('usd', 0)))
+            # DexScreener answers unknown tokens with "pairs": null
+            if data and data.get('pairs'):
+                # Get the most liquid pair (liquidity parsed once per pair)
+                liquidity_usd, pair = max(
+                    ((float(p.get('liquidity', {}).get('usd', 0)), p) for p in data['pairs']),
+                    key=itemgetter(0)
+                )
 
-                # Calculate age in minutes
+                # Calculate age in minutes (pairCreatedAt is in milliseconds)
                 created_at = pair.get('pairCreatedAt', 0)
-                age_minutes = (time.time() * 1000 - created_at) / 60000 if created_at else 0
+                age_minutes = (time.time() - created_at / 1000) / 60 if created_at else 0
+
+                txns_24h = pair.get('txns', {}).get('h24', {})
 
                 return {
-                    "liquidity_usd": float(pair.get('liquidity', {}).get('usd', 0)),
+                    "liquidity_usd": liquidity_usd,
                     "age_minutes": age_minutes,
                     "volume_24h": float(pair.get('volume', {}).get('h24', 0)),
                     "price_usd": float(pair.get('priceUsd', 0)),
                     "price_change_24h": float(pair.get('priceChange', {}).get('h24', 0)),
-                    "txns_24h": pair.get('txns', {}).get('h24', {}).get('buys', 0) + pair.get('txns', {}).get('h24', {}).get('sells', 0),
+                    "txns_24h": txns_24h.get('buys', 0) + txns_24h.get('sells', 0),
                     "dex": pair.get('dexId', 'unknown'),
                     "pair_address": pair.get('pairAddress', ''),
                 }
+
+        # Upstream answered but has no pairs for this token
+        set_negative_cache(neg_key)
     except Exception as e:
         print(f"DexScreener fetch error: {e}")
 
@@ -144,30 +317,93 @@ def fetch_goplus_security(chain: str, token_address: str) -> Optional[Dict]:
     Fetch security data from GoPlusLabs
     Returns: Security analysis including honeypot detection
     """
+    neg_key = ("goplus", chain, token_address)
+    if is_negative_cached(neg_key):
+        return None
+
     try:
-        chain_id = SUPPORTED_CHAINS[chain]["goplus_id"]
-        url = f"{GOPLUS_API}/token_security/{chain_id}"
+        url = GOPLUS_URLS[chain]
         params = {"contract_addresses": token_address}
 
-        response = requests.get(url, params=params, timeout=5)
+        response = SESSION.get(url, params=params, timeout=5)
 
         if response.status_code == 200:
-            data = response.json()
-            if data and 'result' in data and token_address.lower() in data['result']:
-                return data['result'][token_address.lower()]
+            data = orjson.loads(response.content)
+            result_key = token_address.lower()
+            if data and 'result' in data and result_key in data['result']:
+                return data['result'][result_key]
+
+        # Upstream answered but has no security data for this token
+        set_negative_cache(neg_key)
     except Exception as e:
         print(f"GoPlus fetch error: {e}")
 
     return None
 
 
+def submit_upstream_fetches(chain: str, token_address: str,
+                            pool: ThreadPoolExecutor = FETCH_POOL) -> Tuple[Future, Future]:
+    """Start the DexScreener and GoPlus fetches on a thread pool"""
+    dex_future = pool.submit(fetch_dexscreener_data, token_address)
+    security_future = pool.submit(fetch_goplus_security, chain, token_address)
+    return dex_future, security_future
+
+
+def await_upstream(future: Future, deadline: float) -> Tuple[Optional[Dict], bool]:
+    """
+    Wait for an upstream fetch until a monotonic deadline
+    Returns: (data, completed); a late or cancelled fetch gives (None, False)
+    """
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic())), True
+    except FuturesTimeoutError:
+        # Drop the fetch if it hasn't started yet so it doesn't hold a pool thread
+        future.cancel()
+        return None, False
+    except CancelledError:
+        return None, False
+
+
+def await_upstream_pair(dex_future: Future, security_future: Future,
+                        deadline: float) -> Tuple[Optional[Dict], Optional[Dict], bool]:
+    """
+    Wait for both upstream fetches of a token
+    Returns: (dex_data, security_data, completed), completed is False if either missed the deadline
+    """
+    dex_data, dex_completed = await_upstream(dex_future, deadline)
+    security_data, security_completed = await_upstream(security_future, deadline)
+    return dex_data, security_data, dex_completed and security_completed
+
+
+def fetch_upstream_data(chain: str, token_address: str) -> Tuple[Optional[Dict], Optional[Dict], bool]:
+    """
+    Fetch DexScreener and GoPlus data concurrently, waiting at most UPSTREAM_DEADLINE
+    Returns: (dex_data, security_data, completed), either data may be None;
+    completed is False if a source missed the deadline rather than answering
+    """
+    deadline = time.monotonic() + UPSTREAM_DEADLINE
+    dex_future, security_future = submit_upstream_fetches(chain, token_address)
+    return await_upstream_pair(dex_future, security_future, deadline)
+
+
+def tier_penalty(value: float, tiers: Tuple[Tuple[float, ...], Tuple[Tuple[int, str], ...]]) -> Tuple[int, str]:
+    """
+    Look up a value in a tier table built by build_tiers
+    Returns: (penalty, check label) of the first tier whose bound the value is below, else (0, "PASS")
+    """
+    bounds, outcomes = tiers
+    return outcomes[bisect_right(bounds, value)]
+
+
+def clamp_score(value: int) -> int:
+    """Clamp a score to the 0-100 range"""
+    return 0 if value < 0 else 100 if value > 100 else value
+
+
 def analyze_token_safety(chain: str, token_address: str, live_data: Dict, security_data: Optional[Dict], metadata: Dict) -> SafetyCheckResult:
     """
     Analyze token safety using live data + security analysis + metadata
     """
-    checks = {}
-    safety_score = 100
-    rug_risk = 0
     data_source = "live" if live_data else "metadata"
 
     # Use live data if available, otherwise fall back to metadata
@@ -176,126 +412,111 @@ def analyze_token_safety(chain: str, token_address: str, live_data: Dict, securi
     volume_24h = live_data.get("volume_24h", 0) if live_data else metadata.get("volume_24h", 0)
 
     # Token name from metadata or security data
-    token_name = metadata.get("name", "").lower()
+    token_name = metadata.get("name", "")
     if security_data and 'token_name' in security_data:
-        token_name = security_data['token_name'].lower()
-
-    checks["token_name"] = token_name
-    checks["data_source"] = data_source
+        token_name = security_data['token_name']
 
     # 1. LIQUIDITY CHECK
-    checks["liquidity_usd"] = liquidity_usd
-    if liquidity_usd < 1000:
-        safety_score -= 30
-        rug_risk += 30
-        checks["liquidity_check"] = "FAIL - Very low liquidity (< $1K)"
-    elif liquidity_usd < 10000:
-        safety_score -= 15
-        rug_risk += 15
-        checks["liquidity_check"] = "WARNING - Low liquidity (< $10K)"
-    else:
-        checks["liquidity_check"] = "PASS"
+    liquidity_penalty, liquidity_check = tier_penalty(liquidity_usd, LIQUIDITY_TIERS)
 
     # 2. AGE CHECK
-    checks["age_minutes"] = age_minutes
-    if age_minutes < 2:
-        safety_score -= 25
-        rug_risk += 25
-        checks["age_check"] = "FAIL - Very new token (< 2 min, high risk)"
-    elif age_minutes < 30:
-        safety_score -= 10
-        rug_risk += 10
-        checks["age_check"] = "WARNING - New token (< 30 min)"
-    else:
-        checks["age_check"] = "PASS"
+    age_penalty, age_check = tier_penalty(age_minutes, AGE_TIERS)
+
+    safety_score = 100 - liquidity_penalty - age_penalty
+    rug_risk = liquidity_penalty + age_penalty
+
+    checks = {
+        "token_name": token_name,
+        "data_source": data_source,
+        "liquidity_usd": liquidity_usd,
+        "liquidity_check": liquidity_check,
+        "age_minutes": age_minutes,
+        "age_check": age_check,
+    }
 
     # 3. VOLUME CHECK (if available)
     if volume_24h > 0:
         checks["volume_24h"] = volume_24h
-        if volume_24h < 100:
-            safety_score -= 10
-            rug_risk += 10
-            checks["volume_check"] = "WARNING - Very low volume"
-        else:
-            checks["volume_check"] = "PASS"
+        penalty, checks["volume_check"] = tier_penalty(volume_24h, VOLUME_TIERS)
+        safety_score -= penalty
+        rug_risk += penalty
 
     # 4. GOPLUS SECURITY CHECKS
     is_honeypot = False
     if security_data:
-        checks["goplus_available"] = True
+        # Read each GoPlus field once (missing or empty numeric fields count as 0)
+        honeypot_flag = security_data.get('is_honeypot')
+        buy_tax = float(security_data.get('buy_tax') or 0)
+        sell_tax = float(security_data.get('sell_tax') or 0)
+        mintable_flag = security_data.get('is_mintable')
+        owner_address = security_data.get('owner_address')
+        holder_count = int(security_data.get('holder_count') or 0)
 
         # Honeypot check
-        if security_data.get('is_honeypot') == '1':
+        if honeypot_flag == '1':
             is_honeypot = True
             safety_score = min(safety_score, 10)
             rug_risk = max(rug_risk, 90)
-            checks["honeypot_check"] = "FAIL - Confirmed honeypot"
+            honeypot_check = "FAIL - Confirmed honeypot"
         else:
-            checks["honeypot_check"] = "PASS"
+            honeypot_check = "PASS"
 
         # Buy/Sell tax check
-        buy_tax = float(security_data.get('buy_tax', 0))
-        sell_tax = float(security_data.get('sell_tax', 0))
-        checks["buy_tax"] = f"{buy_tax}%"
-        checks["sell_tax"] = f"{sell_tax}%"
-
         if sell_tax > 50:
             safety_score -= 30
             rug_risk += 30
-            checks["tax_check"] = "FAIL - Excessive sell tax"
+            tax_check = "FAIL - Excessive sell tax"
         elif sell_tax > 10 or buy_tax > 10:
             safety_score -= 10
             rug_risk += 10
-            checks["tax_check"] = "WARNING - High tax"
+            tax_check = "WARNING - High tax"
         else:
-            checks["tax_check"] = "PASS"
+            tax_check = "PASS"
 
         # Mint function check
-        if security_data.get('is_mintable') == '1':
+        if mintable_flag == '1':
             safety_score -= 10
             rug_risk += 10
-            checks["mint_check"] = "WARNING - Token is mintable"
+            mint_check = "WARNING - Token is mintable"
         else:
-            checks["mint_check"] = "PASS"
+            mint_check = "PASS"
 
         # Owner check
-        if security_data.get('owner_address') and security_data.get('owner_address') != '0x0000000000000000000000000000000000000000':
+        if owner_address and owner_address != '0x0000000000000000000000000000000000000000':
             safety_score -= 5
             rug_risk += 5
-            checks["ownership_check"] = "WARNING - Ownership not renounced"
+            ownership_check = "WARNING - Ownership not renounced"
         else:
-            checks["ownership_check"] = "PASS"
+            ownership_check = "PASS"
+
+        checks.update({
+            "goplus_available": True,
+            "honeypot_check": honeypot_check,
+            "buy_tax": f"{buy_tax}%",
+            "sell_tax": f"{sell_tax}%",
+            "tax_check": tax_check,
+            "mint_check": mint_check,
+            "ownership_check": ownership_check,
+        })
 
         # Holder count from GoPlus
-        holder_count = int(security_data.get('holder_count', 0))
         if holder_count > 0:
             checks["holder_count"] = holder_count
-            if holder_count < 50:
-                safety_score -= 20
-                rug_risk += 20
-                checks["holder_distribution"] = "FAIL - Too few holders"
-            elif holder_count < 100:
-                safety_score -= 10
-                rug_risk += 10
-                checks["holder_distribution"] = "WARNING - Low holder count"
-            else:
-                checks["holder_distribution"] = "PASS"
+            penalty, checks["holder_distribution"] = tier_penalty(holder_count, HOLDER_TIERS)
+            safety_score -= penalty
+            rug_risk += penalty
     else:
         checks["goplus_available"] = False
         # Fallback to metadata holder count
         holder_count = metadata.get("holder_count", 0)
         if holder_count > 0:
             checks["holder_count"] = holder_count
-            if holder_count < 100:
-                safety_score -= 20
-                rug_risk += 20
-                checks["holder_distribution"] = "FAIL - Too few holders"
-            else:
-                checks["holder_distribution"] = "PASS"
+            penalty, checks["holder_distribution"] = tier_penalty(holder_count, METADATA_HOLDER_TIERS)
+            safety_score -= penalty
+            rug_risk += penalty
 
     # 5. NAME CHECK - Scam keywords
-    scam_keywords = ["test", "fake", "scam", "rug", "honeypot", "xxx", "pump"]
-    if any(keyword in token_name for keyword in scam_keywords):
+    if SCAM_RE.search(token_name):
         safety_score -= 30
         rug_risk += 30
         checks["name_check"] = "FAIL - Suspicious name"
@@ -305,7 +526,7 @@ def analyze_token_safety(chain: str, token_address: str, live_data: Dict, securi
     # 6. FINAL HONEYPOT DETERMINATION
     if not is_honeypot:
         # Heuristic: Low liquidity + new + few holders = likely honeypot
-        if liquidity_usd < 500 and age_minutes < 5 and checks.get("holder_count", 1000) < 50:
+        if liquidity_usd < 500 and age_minutes < 5 and 0 < holder_count < 50:
             is_honeypot = True
             safety_score = min(safety_score, 20)
             rug_risk = max(rug_risk, 80)
@@ -313,8 +534,8 @@ def analyze_token_safety(chain: str, token_address: str, live_data: Dict, securi
                 checks["honeypot_check"] = "FAIL - Likely honeypot (heuristic)"
 
     # Ensure bounds
-    safety_score = max(0, min(100, safety_score))
-    rug_risk = max(0, min(100, rug_risk))
+    safety_score = clamp_score(safety_score)
+    rug_risk = clamp_score(rug_risk)
 
     # Generate recommendation
     if safety_score >= 80:
@@ -340,8 +561,8 @@ def analyze_token_safety(chain: str, token_address: str, live_data: Dict, securi
     )
 
 
-def verify_x402_payment(payment_proof: Optional[str]) -> bool:
-    """Verify x402 payment proof"""
+def verify_x402_payment(payment_proof: Optional[str], checks: int = 1) -> bool:
+    """Verify x402 payment proof (it must cover X402_PRICE_PER_CHECK for each of `checks` checks)"""
     if FREE_MODE:
         return True
 
@@ -351,23 +572,134 @@ def verify_x402_payment(payment_proof: Optional[str]) -> bool:
     return payment_proof.startswith("Bearer ")
 
 
+# /chains and / only change on redeploy, so clients and CDNs may keep them for an hour
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+
+def json_bytes_response(body: bytes) -> Response:
+    """Serve an already-serialized JSON body"""
+    return Response(body, mimetype="application/json")
+
+
+HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "token-safety-oracle",
+    "version": "3.0.0",
+    "free_mode": FREE_MODE,
+    "supported_chains": len(CHAIN_KEYS),
+    "chain_ids": CHAIN_KEYS,
+    "features": {
+        "live_data": True,
+        "dexscreener": True,
+        "goplus_security": True,
+        "cache_ttl": CACHE_TTL
+    }
+})
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "service": "token-safety-oracle",
-        "version": "3.0.0",
-        "free_mode": FREE_MODE,
-        "supported_chains": len(SUPPORTED_CHAINS),
-        "chain_ids": list(SUPPORTED_CHAINS.keys()),
-        "features": {
-            "live_data": True,
-            "dexscreener": True,
-            "goplus_security": True,
-            "cache_ttl": CACHE_TTL
+    return json_bytes_response(HEALTH_BODY)
+
+
+def validate_check_params(token_address: Optional[str], chain: str) -> Optional[Dict]:
+    """Return an error payload if the check parameters are invalid, else None"""
+    if not token_address:
+        return {"error": "token_address is required"}
+
+    if chain not in CHAIN_KEY_SET:
+        return {
+            "error": f"Unsupported chain: {chain}",
+            "supported_chains": CHAIN_KEYS
+        }
+
+    address_re = SOLANA_ADDRESS_RE if chain == "solana" else EVM_ADDRESS_RE
+    if not isinstance(token_address, str) or not address_re.fullmatch(token_address):
+        return {"error": f"Invalid token_address for {chain}"}
+
+    return None
+
+
+def canonical_token_address(chain: str, token_address: str) -> str:
+    """EVM addresses are case-insensitive, so lowercase them once (Solana's base58 is not)"""
+    return token_address if chain == "solana" else token_address.lower()
+
+
+def build_check_response(cache_key: str, chain: str, token_address: str, metadata: Dict,
+                         dex_data: Optional[Dict], security_data: Optional[Dict],
+                         cacheable: bool = True) -> CachedCheck:
+    """
+    Analyze fetched data, build the /check response dict and cache it
+    (unless not cacheable, e.g. a source missed its deadline and the verdict is partial)
+    """
+    # Analyze safety
+    result = analyze_token_safety(chain, token_address, dex_data, security_data, metadata)
+
+    response = {
+        "safe": result.safe,
+        "safety_score": result.safety_score,
+        "rug_pull_risk": result.rug_pull_risk,
+        "is_honeypot": result.is_honeypot,
+        "recommendation": result.recommendation,
+        "checks": result.checks,
+        "chain": result.chain,
+        "token_address": result.token_address,
+        "data_source": result.data_source,
+        "timestamp": time.time(),
+        "from_cache": False,
+        "x402": {
+            "price": X402_PRICE_PER_CHECK,
+            "token": X402_PAYMENT_TOKEN,
+            "free_mode": FREE_MODE
         }
-    })
+    }
+
+    if not cacheable:
+        return make_cached_check(response)
+
+    # Cache the result
+    return set_cache(cache_key, response)
+
+
+def etag_matches(etag: str) -> bool:
+    """Check If-None-Match, ignoring the :br/:gzip suffix Flask-Compress appends to ETags"""
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return True
+    return any(tag.split(":", 1)[0] == etag for tag in if_none_match.as_set(include_weak=True))
+
+
+def set_http_cache_headers(response: Response, entry: CachedCheck) -> Response:
+    """Let clients and CDNs reuse a check result for the rest of its cache TTL"""
+    # Remaining TTL on the monotonic clock, so wall clock steps can't push it past CACHE_TTL
+    max_age = min(CACHE_TTL, max(0, int(CACHE_TTL - (time.monotonic() - entry.cached_at))))
+    response.set_etag(entry.etag, weak=True)
+    response.last_modified = entry.response["timestamp"]
+    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+    return response
+
+
+def read_json_body() -> Any:
+    """Parse the request body with orjson; Werkzeug does not keep the raw buffer around"""
+    try:
+        return orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        return None
+
+
+def payment_required_response(checks: int = 1):
+    """HTTP 402 response for requests without a valid x402 payment proof, priced per check"""
+    payload = {
+        "error": "Payment required",
+        "message": "Valid x402 payment proof required",
+        "price": round(X402_PRICE_PER_CHECK * checks, 6),
+        "token": X402_PAYMENT_TOKEN
+    }
+    if checks > 1:
+        payload["price_per_check"] = X402_PRICE_PER_CHECK
+        payload["checks"] = checks
+    return jsonify(payload), 402
 
 
 @app.route('/check', methods=['POST'])
@@ -391,16 +723,11 @@ def check_token_safety():
     # Check x402 payment
     payment_proof = request.headers.get("Authorization")
     if not verify_x402_payment(payment_proof):
-        return jsonify({
-            "error": "Payment required",
-            "message": "Valid x402 payment proof required",
-            "price": X402_PRICE_PER_CHECK,
-            "token": X402_PAYMENT_TOKEN
-        }), 402
+        return payment_required_response()
 
     # Parse request
     try:
-        data = request.get_json()
+        data = read_json_body()
         if not data:
             return jsonify({"error": "Invalid JSON"}), 400
 
@@ -408,103 +735,182 @@ def check_token_safety():
         chain = data.get("chain", "").lower()
         metadata = data.get("metadata", {})
 
-        if not token_address:
-            return jsonify({"error": "token_address is required"}), 400
+        error = validate_check_params(token_address, chain)
+        if error:
+            return jsonify(error), 400
 
-        if chain not in SUPPORTED_CHAINS:
-            return jsonify({
-                "error": f"Unsupported chain: {chain}",
-                "supported_chains": list(SUPPORTED_CHAINS.keys())
-            }), 400
+        token_address = canonical_token_address(chain, token_address)
 
     except Exception as e:
         return jsonify({"error": f"Invalid request: {str(e)}"}), 400
 
-    # Check cache
-    cache_key = get_cache_key(chain, token_address)
-    cached = get_from_cache(cache_key)
-    if cached:
-        cached["from_cache"] = True
-        return jsonify(cached)
+    try:
+        # Check cache
+        cache_key = get_cache_key(chain, token_address, metadata)
+        cached = get_from_cache(cache_key)
+        if cached:
+            if etag_matches(cached.etag):
+                response = Response(status=304)
+            else:
+                response = json_bytes_response(cached.hit_body)
+            response.headers["X-Cache"] = "HIT"
+            return set_http_cache_headers(response, cached)
+
+        # Fetch from DexScreener and GoPlus
+        dex_data, security_data, completed = fetch_upstream_data(chain, token_address)
+
+        entry = build_check_response(
+            cache_key, chain, token_address, metadata, dex_data, security_data, cacheable=completed
+        )
+        response = jsonify(entry.response)
+        response.headers["X-Cache"] = "MISS"
+        if not completed:
+            # Partial verdict from a timed-out source; don't let clients or CDNs keep it either
+            response.headers["Cache-Control"] = "no-store"
+            return response
+        return set_http_cache_headers(response, entry)
+
+    except Exception as e:
+        return jsonify({"error": f"Safety check failed: {str(e)}"}), 500
+
+
+@app.route('/check_batch', methods=['POST'])
+def check_token_safety_batch():
+    """
+    Check safety for several tokens in one request
 
-    # Fetch live data
+    Request body:
+    {
+        "items": [
+            {"token_address": "string", "chain": "string", "metadata": {...}},
+            ...
+        ]
+    }
+
+    Each item has the same shape as a /check body (at most MAX_BATCH_SIZE items)
+    and is priced like one /check.
+    Results are returned in request order; invalid or failed items carry an "error".
+    """
+
+    # Parse request (first, since the x402 price depends on the item count)
     try:
-        # Fetch from DexScreener
-        dex_data = fetch_dexscreener_data(token_address)
-
-        # Fetch from GoPlus (parallel would be better but sequential is fine)
-        security_data = fetch_goplus_security(chain, token_address)
-
-        # Analyze safety
-        result = analyze_token_safety(chain, token_address, dex_data, security_data, metadata)
-
-        response = {
-            "safe": result.safe,
-            "safety_score": result.safety_score,
-            "rug_pull_risk": result.rug_pull_risk,
-            "is_honeypot": result.is_honeypot,
-            "recommendation": result.recommendation,
-            "checks": result.checks,
-            "chain": result.chain,
-            "token_address": result.token_address,
-            "data_source": result.data_source,
-            "timestamp": time.time(),
-            "from_cache": False,
-            "x402": {
-                "price": X402_PRICE_PER_CHECK,
-                "token": X402_PAYMENT_TOKEN,
-                "free_mode": FREE_MODE
-            }
-        }
+        data = read_json_body()
+        if not data:
+            return jsonify({"error": "Invalid JSON"}), 400
 
-        # Cache the result
-        set_cache(cache_key, response)
+        items = data.get("items")
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "items must be a non-empty list"}), 400
 
-        return jsonify(response)
+        if len(items) > MAX_BATCH_SIZE:
+            return jsonify({"error": f"Too many items (max {MAX_BATCH_SIZE})"}), 400
 
     except Exception as e:
-        return jsonify({"error": f"Safety check failed: {str(e)}"}), 500
+        return jsonify({"error": f"Invalid request: {str(e)}"}), 400
+
+    # Check x402 payment, X402_PRICE_PER_CHECK per item
+    payment_proof = request.headers.get("Authorization")
+    if not verify_x402_payment(payment_proof, len(items)):
+        return payment_required_response(len(items))
+
+    deadline = time.monotonic() + BATCH_UPSTREAM_DEADLINE
+    results = [None] * len(items)
+    pending = []
+    fetches = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = {"error": "Invalid item"}
+            continue
+
+        token_address = item.get("token_address")
+        chain = str(item.get("chain", "")).lower()
+        metadata = item.get("metadata", {})
+
+        error = validate_check_params(token_address, chain)
+        if error:
+            results[index] = error
+            continue
+
+        token_address = canonical_token_address(chain, token_address)
+
+        try:
+            cache_key = get_cache_key(chain, token_address, metadata)
+        except Exception as e:
+            results[index] = {"error": f"Invalid request: {str(e)}"}
+            continue
+
+        cached = get_from_cache(cache_key)
+        if cached:
+            results[index] = {**cached.response, "from_cache": True}
+            continue
+
+        # Start upstream fetches for every uncached token before waiting on any
+        fetch_key = (chain, token_address)
+        if fetch_key not in fetches:
+            fetches[fetch_key] = submit_upstream_fetches(chain, token_address, BATCH_FETCH_POOL)
+        pending.append((index, cache_key, chain, token_address, metadata))
+
+    # Wait on each unique token's fetches once; duplicate items reuse the outcome
+    fetched = {
+        fetch_key: await_upstream_pair(dex_future, security_future, deadline)
+        for fetch_key, (dex_future, security_future) in fetches.items()
+    }
+
+    for index, cache_key, chain, token_address, metadata in pending:
+        dex_data, security_data, completed = fetched[(chain, token_address)]
+        try:
+            results[index] = build_check_response(
+                cache_key, chain, token_address, metadata, dex_data, security_data, cacheable=completed
+            ).response
+        except Exception as e:
+            results[index] = {"error": f"Safety check failed: {str(e)}"}
+
+    return jsonify({"results": results, "count": len(results)})
+
+
+CHAINS_BODY = orjson.dumps({"chains": CHAINS_PAYLOAD})
 
 
 @app.route('/chains', methods=['GET'])
 def get_supported_chains():
     """Get list of supported chains"""
-    chains = []
-    for chain_key, chain_info in SUPPORTED_CHAINS.items():
-        chains.append({
-            "key": chain_key,
-            "name": chain_info["name"],
-            "chain_id": chain_info["chain_id"]
-        })
-    return jsonify({"chains": chains})
+    response = json_bytes_response(CHAINS_BODY)
+    response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+    return response
+
+
+INDEX_BODY = orjson.dumps({
+    "service": "x402 Token Safety Oracle",
+    "version": "3.0.0",
+    "description": "Multi-chain token safety analysis with LIVE DATA from DexScreener + GoPlusLabs",
+    "endpoints": {
+        "/health": "Health check",
+        "/check": "Check token safety (POST) - Uses LIVE blockchain data",
+        "/check_batch": f"Check up to {MAX_BATCH_SIZE} tokens in one request (POST), priced per token",
+        "/chains": "Get supported chains",
+        "/": "This documentation"
+    },
+    "supported_chains": CHAIN_KEYS,
+    "features": {
+        "live_data": "DexScreener for liquidity, volume, age",
+        "security_analysis": "GoPlusLabs for honeypot detection, tax analysis",
+        "caching": f"{CACHE_TTL}s TTL for faster responses"
+    },
+    "x402": {
+        "enabled": not FREE_MODE,
+        "price_per_check": X402_PRICE_PER_CHECK,
+        "payment_token": X402_PAYMENT_TOKEN
+    },
+    "documentation": "https://github.com/DeganAI/token-safety-oracle"
+})
 
 
 @app.route('/', methods=['GET'])
 def index():
     """API documentation"""
-    return jsonify({
-        "service": "x402 Token Safety Oracle",
-        "version": "3.0.0",
-        "description": "Multi-chain token safety analysis with LIVE DATA from DexScreener + GoPlusLabs",
-        "endpoints": {
-            "/health": "Health check",
-            "/check": "Check token safety (POST) - Uses LIVE blockchain data",
-            "/chains": "Get supported chains",
-            "/": "This documentation"
-        },
-        "supported_chains": list(SUPPORTED_CHAINS.keys()),
-        "features": {
-            "live_data": "DexScreener for liquidity, volume, age",
-            "security_analysis": "GoPlusLabs for honeypot detection, tax analysis",
-            "caching": f"{CACHE_TTL}s TTL for faster responses"
-        },
-        "x402": {
-            "enabled": not FREE_MODE,
-            "price_per_check": X402_PRICE_PER_CHECK,
-            "payment_token": X402_PAYMENT_TOKEN
-        },
-        "documentation": "https://github.com/DeganAI/token-safety-oracle"
-    })
+    response = json_bytes_response(INDEX_BODY)
+    response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+    return response
 
 
 if __name__ == '__main__':
@@ -515,8 +921,9 @@ if __name__ == '__main__':
     print(f"Free Mode: {FREE_MODE}")
     print(f"Data Sources: DexScreener + GoPlusLabs")
     print(f"Cache TTL: {CACHE_TTL}s")
-    print(f"Supported chains: {', '.join(SUPPORTED_CHAINS.keys())}")
+    print(f"Supported chains: {', '.join(CHAIN_KEYS)}")
     print(f"Port: {PORT}")
     print("=" * 60)
 
+    # Development server only; deployments run: gunicorn -c gunicorn_conf.py app:app
     app.run(host='0.0.0.0', port=PORT, debug=False)
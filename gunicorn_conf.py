@@ -0,0 +1,23 @@
+"""
+Gunicorn configuration for the Token Safety Oracle
+Usage: gunicorn -c gunicorn_conf.py app:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Worker processes: checks are I/O-bound, so scale with threads rather than processes
+# (each process keeps its own result and negative caches)
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+
+# Threaded workers: requests mostly wait on upstream HTTP, so threads are cheap concurrency
+worker_class = "gthread"
+# (app.py sizes its upstream fetch pool from GUNICORN_THREADS too; keep the defaults in sync)
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+
+# Load app.py once in the master so precomputed tables are shared copy-on-write
+preload_app = True
+
+timeout = 30
+keepalive = 5